@@ -14,18 +14,8 @@ if (-not (Test-Path $py)) {
 
 Write-Host "Running pipeline..."
 
-& $py "src\smoke_test.py"
-
-& $py "src\pipeline\ingest_admin1.py"
-& $py "src\pipeline\ingest_populated_places.py"
-
-& $py "src\pipeline\standardize_admin1.py"
-& $py "src\pipeline\standardize_populated_places.py"
-
-& $py "src\pipeline\validate_admin1.py"
-
-& $py "src\pipeline\model_admin1_duckdb.py"
-& $py "src\pipeline\analyze_cities_to_admin1.py"
+& $py "src\gisde.py" all
+if ($LASTEXITCODE -ne 0) { exit $LASTEXITCODE }
 
 Write-Host "DONE. Outputs:"
 Write-Host "  - docs/qa/admin1_qa_report.csv"
@@ -13,17 +13,6 @@ if [[ ! -f "$PY" ]]; then
 fi
 
 echo "Running pipeline..."
-"$PY" src/smoke_test.py
-
-"$PY" src/pipeline/ingest_admin1.py
-"$PY" src/pipeline/ingest_populated_places.py
-
-"$PY" src/pipeline/standardize_admin1.py
-"$PY" src/pipeline/standardize_populated_places.py
-
-"$PY" src/pipeline/validate_admin1.py
-
-"$PY" src/pipeline/model_admin1_duckdb.py
-"$PY" src/pipeline/analyze_cities_to_admin1.py
+"$PY" src/gisde.py all
 
 echo "DONE."
\ No newline at end of file
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent
+
+# name -> (module under src/, forwards its own CLI args, help)
+# Modules are imported only when their command runs, so `gisde --help` and the
+# lightweight commands never pay for geopandas/pyproj/shapely/duckdb imports.
+COMMANDS: dict[str, tuple[str, bool, str]] = {
+    "smoke": ("smoke_test", False, "GeoPandas + DuckDB spatial smoke test"),
+    "ingest-admin1": ("pipeline.ingest_admin1", False, "download Natural Earth admin1"),
+    "ingest-places": ("pipeline.ingest_populated_places", False, "download populated places"),
+    "standardize-admin1": ("pipeline.standardize_admin1", False, "admin1 -> GeoParquet"),
+    "standardize-places": (
+        "pipeline.standardize_populated_places",
+        False,
+        "populated places -> GeoParquet",
+    ),
+    "validate": ("pipeline.validate_admin1", False, "admin1 QA report"),
+    "model": ("pipeline.model_admin1_duckdb", False, "load admin1 into DuckDB + area table"),
+    "analyze": ("pipeline.analyze_cities_to_admin1", False, "city->admin1 join + summaries"),
+    "analyze-partitioned": (
+        "pipeline.analyze_cities_to_admin1_partitioned",
+        True,
+        "out-of-core city->admin1 join",
+    ),
+    "publish": ("pipeline.publish_db_snapshot", False, "publish gis.duckdb snapshot"),
+    "export-web": ("pipeline.export_web_assets", False, "web GeoJSON for docs/"),
+    "serve": ("service.query_service", True, "read-only query service"),
+}
+
+# What `gisde all` runs (same order as run_all.sh / CI)
+PIPELINE = [
+    "smoke",
+    "ingest-admin1",
+    "ingest-places",
+    "standardize-admin1",
+    "standardize-places",
+    "validate",
+    "model",
+    "analyze",
+    "publish",
+]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="gisde", description="GIS spatial data engineering pipeline.")
+    sub = p.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name, (_, forwards, help_) in COMMANDS.items():
+        # Commands with their own argparse get --help and options passed through untouched
+        sub.add_parser(name, help=help_, add_help=not forwards)
+    sub.add_parser("all", help="run the full pipeline: " + ", ".join(PIPELINE))
+    return p
+
+
+def setup_path() -> None:
+    # Stage modules import pipeline helpers (e.g. `reproject`) by bare name, as when run as scripts
+    for p in (SRC / "pipeline", SRC):
+        if str(p) not in sys.path:
+            sys.path.insert(0, str(p))
+
+
+def run_command(name: str, argv: list[str] | None = None) -> int:
+    module, forwards, _ = COMMANDS[name]
+    setup_path()
+    main = importlib.import_module(module).main
+    if not forwards:
+        return main()
+    # Stage parsers take their prog from argv[0]: show `gisde serve`, not `gisde.py`
+    saved, sys.argv[0] = sys.argv[0], f"gisde {name}"
+    try:
+        return main(argv or [])
+    finally:
+        sys.argv[0] = saved
+
+
+def main(argv: list[str] | None = None) -> int:
+    args, rest = build_parser().parse_known_args(argv)
+
+    if args.command == "all":
+        if rest:
+            raise SystemExit(f"gisde all: unexpected arguments: {' '.join(rest)}")
+        for name in PIPELINE:
+            t0 = time.perf_counter()
+            print(f"== gisde {name}")
+            rc = run_command(name)
+            print(f"== gisde {name}: rc={rc} ({time.perf_counter() - t0:.1f}s)")
+            if rc:
+                return rc
+        return 0
+
+    if rest and not COMMANDS[args.command][1]:
+        raise SystemExit(f"gisde {args.command}: unexpected arguments: {' '.join(rest)}")
+    return run_command(args.command, rest)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
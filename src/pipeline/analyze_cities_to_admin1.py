@@ -2,15 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
-
 ADMIN1_STD = Path("data/processed/natural_earth/admin1_standardized.geoparquet")
 CITIES_STD = Path("data/processed/natural_earth/populated_places_standardized.geoparquet")
 
 DB_PATH = Path("data/processed/db/gis.duckdb")
 
 OUT_DIR = Path("docs/results")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_COUNTS = OUT_DIR / "cities_by_admin1_top50.csv"
 OUT_CANADA = OUT_DIR / "cities_by_canada_province.csv"
@@ -23,6 +20,11 @@ def main() -> int:
     if not CITIES_STD.exists():
         raise FileNotFoundError(f"Missing cities standardized: {CITIES_STD.resolve()}")
 
+    import duckdb
+
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
     con = duckdb.connect(str(DB_PATH))
     con.execute("INSTALL spatial;")
     con.execute("LOAD spatial;")
@@ -73,27 +75,32 @@ def main() -> int:
 
     # Spatial join: assign each city to an admin1 polygon
     # Use ST_Intersects (points within polygon). (For points, intersects behaves like within if the point is inside.)
-    join_sql = """
-    WITH joined AS (
-      SELECT
-        c.name AS city_name,
-        c.adm0name AS country,
-        c.adm0_a3 AS country_a3,
-        c.pop_max AS pop_max,
-        a.admin AS admin_country,
-        a.name AS admin1_name,
-        a.adm1_code AS adm1_code
-      FROM cities c
-      JOIN admin1 a
-        ON ST_Intersects(a.geom, c.geom)
+    # Materialized so downstream consumers (query service, ad-hoc SQL) don't re-run the join.
+    con.execute(
+        """
+        CREATE OR REPLACE TABLE city_admin1 AS
+        SELECT
+          c.name AS city_name,
+          c.adm0name AS country,
+          c.adm0_a3 AS country_a3,
+          c.pop_max AS pop_max,
+          a.admin AS admin_country,
+          a.name AS admin1_name,
+          a.adm1_code AS adm1_code
+        FROM cities c
+        JOIN admin1 a
+          ON ST_Intersects(a.geom, c.geom);
+        """
     )
+
+    join_sql = """
     SELECT
       admin_country,
       admin1_name,
       adm1_code,
       COUNT(*) AS city_count,
       ROUND(SUM(COALESCE(pop_max, 0))::DOUBLE, 0) AS sum_pop_max
-    FROM joined
+    FROM city_admin1
     GROUP BY 1,2,3
     ORDER BY city_count DESC, sum_pop_max DESC
     LIMIT 50;
@@ -105,23 +112,13 @@ def main() -> int:
     # Canada-only breakdown (all provinces/territories)
     df_ca = con.execute(
         """
-        WITH joined AS (
-          SELECT
-            c.name AS city_name,
-            c.pop_max AS pop_max,
-            a.name AS province,
-            a.adm1_code AS adm1_code
-          FROM cities c
-          JOIN admin1 a
-            ON ST_Intersects(a.geom, c.geom)
-          WHERE a.admin = 'Canada'
-        )
         SELECT
-          province,
+          admin1_name AS province,
           adm1_code,
           COUNT(*) AS city_count,
           ROUND(SUM(COALESCE(pop_max, 0))::DOUBLE, 0) AS sum_pop_max
-        FROM joined
+        FROM city_admin1
+        WHERE admin_country = 'Canada'
         GROUP BY 1,2
         ORDER BY city_count DESC, sum_pop_max DESC;
         """
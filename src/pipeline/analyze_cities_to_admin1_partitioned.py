@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import argparse
+import math
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+    import pandas as pd
+
+ADMIN1_STD = Path("data/processed/natural_earth/admin1_standardized.geoparquet")
+CITIES_STD = Path("data/processed/natural_earth/populated_places_standardized.geoparquet")
+
+OUT_DIR = Path("docs/results")
+OUT_COUNTS = OUT_DIR / "cities_by_admin1_top50.csv"
+
+GROUP_COLS = ["admin_country", "admin1_name", "adm1_code"]
+
+# Cell ids come from floor((x + 180) / cell_deg) but bounds from -180 + col * cell_deg; with
+# non-integer cell sizes the two can disagree by an ulp, so the polygon prefilter is widened.
+BBOX_EPS = 1e-9
+
+
+def _sql_path(p: Path) -> str:
+    return p.as_posix().replace("'", "''")
+
+
+def _connect(memory_limit: str, threads: int, temp_dir: Path) -> duckdb.DuckDBPyConnection:
+    # temp_dir must be private to this connection: DuckDB uses fixed spill file names and
+    # deletes every duckdb_temp_* file in the directory on close
+    import duckdb
+
+    con = duckdb.connect(database=":memory:")
+    con.execute("LOAD spatial;")
+    con.execute(f"SET memory_limit = '{memory_limit}';")
+    con.execute(f"SET threads = {int(threads)};")
+    con.execute(f"SET temp_directory = '{_sql_path(temp_dir)}';")
+    con.execute("SET preserve_insertion_order = false;")
+    return con
+
+
+def _geom_expr(con: duckdb.DuckDBPyConnection, path: str) -> str:
+    # GeoParquet geometry is either read as GEOMETRY already or as a WKB blob
+    t = con.execute(f"SELECT typeof(geometry) FROM read_parquet('{path}') LIMIT 1").fetchone()
+    if t is not None and "GEOMETRY" in str(t[0]).upper():
+        return "geometry"
+    return "ST_GeomFromWKB(geometry)"
+
+
+def grid_shape(cell_deg: float) -> tuple[int, int]:
+    """Number of (columns, rows) in a global lon/lat grid of `cell_deg` cells."""
+    return math.ceil(360 / cell_deg), math.ceil(180 / cell_deg)
+
+
+def cell_bounds(cell: int, cell_deg: float) -> tuple[float, float, float, float]:
+    """(xmin, ymin, xmax, ymax) of a grid cell id produced by `partition_points`."""
+    ncols, _ = grid_shape(cell_deg)
+    row, col = divmod(cell, ncols)
+    xmin = -180 + col * cell_deg
+    ymin = -90 + row * cell_deg
+    return xmin, ymin, xmin + cell_deg, ymin + cell_deg
+
+
+def _weight_expr(con: duckdb.DuckDBPyConnection, path: str, weight_col: str | None) -> str:
+    # Points without a weight (e.g. GPS pings) still get counted; their sum_pop_max is 0
+    if not weight_col:
+        return "0::DOUBLE"
+    cols = [r[0] for r in con.execute(f"DESCRIBE SELECT * FROM read_parquet('{path}')").fetchall()]
+    if weight_col not in cols:
+        raise ValueError(
+            f"Weight column {weight_col!r} not in {path} (pass --weight-col '' for unweighted points)"
+        )
+    return '"' + weight_col.replace('"', '""') + '"'
+
+
+def partition_points(
+    con: duckdb.DuckDBPyConnection,
+    points: Path,
+    spill_dir: Path,
+    cell_deg: float,
+    weight_col: str | None = "pop_max",
+) -> list[int]:
+    """Spill points to one parquet directory per grid cell and return the cell ids.
+
+    DuckDB streams the partitioned COPY, so the input never has to fit in memory.
+    Only x/y and the weight column (summed into `sum_pop_max`) are kept.
+    """
+    p_path = _sql_path(points)
+    geom = _geom_expr(con, p_path)
+    weight = _weight_expr(con, p_path, weight_col)
+    ncols, nrows = grid_shape(cell_deg)
+    # No stale cells from a reused spill dir
+    shutil.rmtree(spill_dir / "points", ignore_errors=True)
+    out = _sql_path(spill_dir / "points")
+
+    con.execute(
+        f"""
+        COPY (
+          SELECT
+            x,
+            y,
+            weight,
+            LEAST(GREATEST(CAST(floor((y + 90) / {cell_deg}) AS BIGINT), 0), {nrows - 1}) * {ncols}
+              + LEAST(GREATEST(CAST(floor((x + 180) / {cell_deg}) AS BIGINT), 0), {ncols - 1})
+              AS cell
+          FROM (
+            SELECT ST_X(g) AS x, ST_Y(g) AS y, weight
+            FROM (SELECT {geom} AS g, {weight} AS weight FROM read_parquet('{p_path}'))
+            WHERE g IS NOT NULL AND NOT ST_IsEmpty(g)
+          )
+        ) TO '{out}' (FORMAT PARQUET, PARTITION_BY (cell), OVERWRITE_OR_IGNORE);
+        """
+    )
+    # Hive layout: <spill>/points/cell=<id>/data_*.parquet
+    return sorted(int(d.name.split("=", 1)[1]) for d in (spill_dir / "points").glob("cell=*"))
+
+
+def stage_admin1(con: duckdb.DuckDBPyConnection, admin1: Path, spill_dir: Path) -> Path:
+    """Write admin1 polygons with precomputed bboxes so partitions can prefilter cheaply."""
+    a_path = _sql_path(admin1)
+    geom = _geom_expr(con, a_path)
+    out = spill_dir / "admin1_bbox.parquet"
+    con.execute(
+        f"""
+        COPY (
+          SELECT
+            admin AS admin_country,
+            name AS admin1_name,
+            adm1_code,
+            ST_AsWKB(g) AS wkb,
+            ST_XMin(g) AS xmin,
+            ST_YMin(g) AS ymin,
+            ST_XMax(g) AS xmax,
+            ST_YMax(g) AS ymax
+          FROM (SELECT *, {geom} AS g FROM read_parquet('{a_path}'))
+        ) TO '{_sql_path(out)}' (FORMAT PARQUET);
+        """
+    )
+    return out
+
+
+def join_partition(
+    cell: int,
+    cell_deg: float,
+    spill_dir: Path,
+    admin1_bbox: Path,
+    memory_limit: str,
+) -> pd.DataFrame:
+    """Join one point partition against the admin1 polygons whose bbox touches the cell.
+
+    Returns partial aggregates (count + raw weight sum) per admin1 polygon.
+    """
+    import pandas as pd
+
+    xmin, ymin, xmax, ymax = cell_bounds(cell, cell_deg)
+    xmin, ymin, xmax, ymax = xmin - BBOX_EPS, ymin - BBOX_EPS, xmax + BBOX_EPS, ymax + BBOX_EPS
+    temp_dir = spill_dir / "duckdb_tmp" / f"cell={cell}"
+    con = _connect(memory_limit, threads=1, temp_dir=temp_dir)
+    try:
+        con.execute(
+            f"""
+            CREATE TEMP TABLE a AS
+            SELECT admin_country, admin1_name, adm1_code, ST_GeomFromWKB(wkb) AS geom
+            FROM read_parquet('{_sql_path(admin1_bbox)}')
+            WHERE xmax >= {xmin} AND xmin <= {xmax}
+              AND ymax >= {ymin} AND ymin <= {ymax};
+            """
+        )
+        if con.execute("SELECT COUNT(*) FROM a").fetchone()[0] == 0:
+            return pd.DataFrame(columns=GROUP_COLS + ["city_count", "sum_pop_max"])
+
+        part = _sql_path(spill_dir / "points" / f"cell={cell}")
+        return con.execute(
+            f"""
+            SELECT
+              a.admin_country,
+              a.admin1_name,
+              a.adm1_code,
+              COUNT(*) AS city_count,
+              SUM(COALESCE(p.weight, 0))::DOUBLE AS sum_pop_max
+            FROM read_parquet('{part}/*.parquet') p
+            JOIN a
+              ON ST_Intersects(a.geom, ST_Point(p.x, p.y))
+            GROUP BY 1,2,3;
+            """
+        ).df()
+    finally:
+        con.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def merge_partials(partials: list[pd.DataFrame], limit: int | None = 50) -> pd.DataFrame:
+    """Combine per-partition aggregates into the `cities_by_admin1_top50.csv` layout."""
+    import pandas as pd
+
+    partials = [p for p in partials if len(p)]
+    if not partials:
+        return pd.DataFrame(columns=GROUP_COLS + ["city_count", "sum_pop_max"])
+
+    df = (
+        pd.concat(partials, ignore_index=True)
+        .groupby(GROUP_COLS, dropna=False, as_index=False)
+        .agg(city_count=("city_count", "sum"), sum_pop_max=("sum_pop_max", "sum"))
+    )
+    df["city_count"] = df["city_count"].astype("int64")
+    df["sum_pop_max"] = df["sum_pop_max"].astype("float64").round(0)
+    df = df.sort_values(
+        ["city_count", "sum_pop_max", "adm1_code"], ascending=[False, False, True]
+    ).reset_index(drop=True)
+    if limit is not None:
+        df = df.head(limit)
+    return df
+
+
+def run(
+    points: Path,
+    admin1: Path,
+    cell_deg: float = 10.0,
+    workers: int = 4,
+    worker_memory: str = "1GB",
+    spill_dir: Path | None = None,
+    limit: int | None = 50,
+    weight_col: str | None = "pop_max",
+) -> pd.DataFrame:
+    import duckdb
+
+    own_spill = spill_dir is None
+    spill = Path(tempfile.mkdtemp(prefix="gis_partjoin_")) if own_spill else spill_dir
+    spill.mkdir(parents=True, exist_ok=True)
+    try:
+        con = duckdb.connect(database=":memory:")
+        con.execute("INSTALL spatial;")
+        con.close()
+
+        temp_dir = spill / "duckdb_tmp" / "partition"
+        con = _connect(worker_memory, threads=workers, temp_dir=temp_dir)
+        try:
+            cells = partition_points(con, points, spill, cell_deg, weight_col)
+            admin1_bbox = stage_admin1(con, admin1, spill)
+        finally:
+            con.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        print("OK: partitioned points into", len(cells), "cells of", cell_deg, "deg")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            partials = list(
+                pool.map(
+                    lambda c: join_partition(c, cell_deg, spill, admin1_bbox, worker_memory),
+                    cells,
+                )
+            )
+        return merge_partials(partials, limit=limit)
+    finally:
+        if own_spill:
+            shutil.rmtree(spill, ignore_errors=True)
+        else:
+            shutil.rmtree(spill / "duckdb_tmp", ignore_errors=True)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Out-of-core city->admin1 join: grid-partitioned, bbox-pruned, parallel."
+    )
+    p.add_argument("--points", type=Path, default=CITIES_STD, help="point GeoParquet")
+    p.add_argument(
+        "--weight-col",
+        default="pop_max",
+        help="points column summed into sum_pop_max ('' = unweighted, sums are 0)",
+    )
+    p.add_argument("--admin1", type=Path, default=ADMIN1_STD, help="admin1 GeoParquet")
+    p.add_argument("--out", type=Path, default=OUT_COUNTS)
+    p.add_argument("--cell-deg", type=float, default=10.0, help="grid cell size in degrees")
+    p.add_argument("--workers", type=int, default=4, help="partitions joined in parallel")
+    p.add_argument("--worker-memory", default="1GB", help="DuckDB memory_limit per worker")
+    p.add_argument("--spill-dir", type=Path, default=None, help="keep spill files here")
+    p.add_argument("--limit", type=int, default=50, help="rows to keep (0 = all)")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.admin1.exists():
+        raise FileNotFoundError(f"Missing admin1 standardized: {args.admin1.resolve()}")
+    if not args.points.exists():
+        raise FileNotFoundError(f"Missing points: {args.points.resolve()}")
+
+    df = run(
+        args.points,
+        args.admin1,
+        cell_deg=args.cell_deg,
+        workers=args.workers,
+        worker_memory=args.worker_memory,
+        spill_dir=args.spill_dir,
+        limit=args.limit or None,
+        weight_col=args.weight_col or None,
+    )
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print("OK: wrote", args.out.as_posix(), "| rows =", len(df))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
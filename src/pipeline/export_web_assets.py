@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from pathlib import Path
-import geopandas as gpd
+from typing import TYPE_CHECKING
+
+from reproject import reproject
+
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 ADMIN1_SAMPLE = Path("data/sample/admin1_canada_sample.geoparquet")
 CITIES_SAMPLE = Path("data/sample/populated_places_canada_sample.geoparquet")
 
 OUT_DIR = Path("docs/data")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_ADMIN1 = OUT_DIR / "canada_admin1.geojson"
 OUT_CITIES = OUT_DIR / "canada_cities.geojson"
@@ -15,9 +19,9 @@ OUT_CITIES = OUT_DIR / "canada_cities.geojson"
 
 def simplify_for_web(gdf: gpd.GeoDataFrame, meters: float = 5000) -> gpd.GeoDataFrame:
     # Simplify in a metric CRS for better control, then return to WGS84 for web maps
-    g = gdf.to_crs(3857).copy()
-    g["geometry"] = g["geometry"].simplify(meters, preserve_topology=True)
-    return g.to_crs(4326)
+    g = reproject(gdf, 3857)
+    g = g.set_geometry(g.geometry.simplify(meters, preserve_topology=True))
+    return reproject(g, 4326)
 
 
 def main() -> int:
@@ -26,8 +30,10 @@ def main() -> int:
     if not CITIES_SAMPLE.exists():
         raise FileNotFoundError(f"Missing {CITIES_SAMPLE}. Run standardize_populated_places first.")
 
-    admin1 = gpd.read_parquet(ADMIN1_SAMPLE).to_crs(4326)
-    cities = gpd.read_parquet(CITIES_SAMPLE).to_crs(4326)
+    import geopandas as gpd
+
+    admin1 = reproject(gpd.read_parquet(ADMIN1_SAMPLE), 4326)
+    cities = reproject(gpd.read_parquet(CITIES_SAMPLE), 4326)
 
     # Keep only useful columns (keeps files small)
     keep_admin1 = [c for c in ["name", "adm1_code", "admin"] if c in admin1.columns]
@@ -38,6 +44,7 @@ def main() -> int:
 
     admin1 = simplify_for_web(admin1, meters=7000)
 
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
     admin1.to_file(OUT_ADMIN1, driver="GeoJSON")
     cities.to_file(OUT_CITIES, driver="GeoJSON")
 
@@ -4,7 +4,6 @@ from pathlib import Path
 from urllib.request import urlretrieve
 
 RAW_DIR = Path("data/raw/natural_earth")
-RAW_DIR.mkdir(parents=True, exist_ok=True)
 
 URL = "https://raw.githubusercontent.com/nvkelso/natural-earth-vector/master/geojson/ne_10m_admin_1_states_provinces.geojson"
 OUT = RAW_DIR / "ne_10m_admin_1_states_provinces.geojson"
@@ -26,6 +25,7 @@ def main() -> int:
         print(f"OK: already downloaded ({size_mb:.2f} MB) -> {OUT.resolve()}")
         return 0
 
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
     urlretrieve(URL, OUT)
 
     size_mb = OUT.stat().st_size / (1024 * 1024)
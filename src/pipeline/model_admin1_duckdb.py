@@ -2,15 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
-
 STD = Path("data/processed/natural_earth/admin1_standardized.geoparquet")
 
 DB_PATH = Path("data/processed/db/gis.duckdb")
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 OUT_DIR = Path("docs/results")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_CANADA = OUT_DIR / "admin1_canada_area_km2.csv"
 OUT_EXPLAIN = OUT_DIR / "admin1_rtree_explain.txt"
@@ -22,6 +18,11 @@ def main() -> int:
             f"Missing standardized file: {STD.resolve()} (run standardize first)"
         )
 
+    import duckdb
+
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
     con = duckdb.connect(str(DB_PATH))
     con.execute("INSTALL spatial;")
     con.execute("LOAD spatial;")
@@ -61,13 +62,22 @@ def main() -> int:
 
     # Example “developer-grade” metric: geodesic area in km2 for Canada provinces/territories.
     # DuckDB’s spheroid funcs assume [latitude, longitude] axis order, so we flip coords first. :contentReference[oaicite:1]{index=1}
-    df = con.execute(
+    # Materialized for all countries so the query service can serve it without the spatial extension.
+    con.execute(
         """
+        CREATE OR REPLACE TABLE admin1_area AS
         SELECT
+          admin,
           name,
           adm1_code,
           ROUND(ST_Area_Spheroid(ST_FlipCoordinates(geom)) / 1e6, 2) AS area_km2
-        FROM admin1
+        FROM admin1;
+        """
+    )
+    df = con.execute(
+        """
+        SELECT name, adm1_code, area_km2
+        FROM admin1_area
         WHERE admin = 'Canada'
         ORDER BY area_km2 DESC;
         """
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+DB_PATH = Path("data/processed/db/gis.duckdb")
+
+SNAP_DIR = Path("data/processed/db/snapshots")
+CURRENT = SNAP_DIR / "CURRENT"  # one line: file name of the live snapshot
+KEEP = 3
+
+
+def publish(db_path: Path = DB_PATH, snap_dir: Path = SNAP_DIR, keep: int = KEEP) -> Path:
+    """Copy the pipeline DB to an immutable snapshot and atomically point CURRENT at it.
+
+    Readers only ever open snapshots, so they never hold a lock on the file the
+    pipeline is writing, and a changed CURRENT tells them a new version is live.
+    """
+    snap_dir.mkdir(parents=True, exist_ok=True)
+
+    ns = time.time_ns()
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(ns // 10**9))
+    name = f"gis-{stamp}-{ns % 10**9:09d}.duckdb"  # sorts chronologically
+    snap = snap_dir / name
+    tmp = snap.with_suffix(".duckdb.tmp")
+    shutil.copyfile(db_path, tmp)
+    os.replace(tmp, snap)
+
+    pointer_tmp = snap_dir / "CURRENT.tmp"
+    pointer_tmp.write_text(name + "\n", encoding="utf-8")
+    os.replace(pointer_tmp, snap_dir / CURRENT.name)
+
+    # Old snapshots may still be open by readers (Windows refuses to delete those); skip them
+    old = sorted(snap_dir.glob("gis-*.duckdb"))[:-keep] if keep > 0 else []
+    for p in old:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+    return snap
+
+
+def main() -> int:
+    if not DB_PATH.exists():
+        raise FileNotFoundError(f"Missing database: {DB_PATH.resolve()} (run model/analyze first)")
+
+    snap = publish()
+    print("OK: published snapshot", snap.as_posix())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import geopandas as gpd
+    import numpy as np
+    from pyproj import CRS, Transformer
+
+# Layers with fewer coordinates than this are transformed in-process;
+# below it the process pool's startup and pickling cost more than they save.
+PARALLEL_MIN_COORDS = 2_000_000
+
+# pyproj CRS/Transformer objects are not thread-safe, so caches are per thread
+# (stages may run on threads, e.g. the partitioned join's ThreadPoolExecutor).
+_local = threading.local()
+
+
+def _thread_cache(name: str) -> dict:
+    cache = getattr(_local, name, None)
+    if cache is None:
+        cache = {}
+        setattr(_local, name, cache)
+    return cache
+
+
+def _crs(user_input: Any) -> CRS:
+    from pyproj import CRS
+
+    cache = _thread_cache("crs")
+    if user_input not in cache:
+        cache[user_input] = CRS.from_user_input(user_input)
+    return cache[user_input]
+
+
+def same_crs(src: Any, dst: Any) -> bool:
+    """True when transforming src -> dst would be a no-op (axis order ignored, we use always_xy)."""
+    return _crs(src).equals(_crs(dst), ignore_axis_order=True)
+
+
+def get_transformer(src: Any, dst: Any) -> Transformer:
+    """Per-thread cached always_xy Transformer; building one (PROJ pipeline lookup) is the expensive part."""
+    from pyproj import Transformer
+
+    cache = _thread_cache("transformers")
+    if (src, dst) not in cache:
+        cache[(src, dst)] = Transformer.from_crs(_crs(src), _crs(dst), always_xy=True)
+    return cache[(src, dst)]
+
+
+def transform_geoms(geoms: np.ndarray, src: Any, dst: Any) -> np.ndarray:
+    """Reproject an array of shapely geometries by transforming their raw coordinate buffer at once."""
+    import numpy as np
+    import shapely
+
+    t = get_transformer(src, dst)
+
+    def _apply(coords: np.ndarray) -> np.ndarray:
+        return np.column_stack(t.transform(*coords.T))
+
+    # include_z=True would hand NaN z to PROJ for 2D geometries, so mixed layers go in two passes
+    has_z = shapely.has_z(geoms)
+    if not has_z.any():
+        return shapely.transform(geoms, _apply)
+    if has_z.all():
+        return shapely.transform(geoms, _apply, include_z=True)
+    out = np.empty(len(geoms), dtype=object)
+    out[has_z] = shapely.transform(geoms[has_z], _apply, include_z=True)
+    out[~has_z] = shapely.transform(geoms[~has_z], _apply)
+    return out
+
+
+def _transform_chunk(args: tuple[np.ndarray, str, str]) -> np.ndarray:
+    geoms, src_wkt, dst_wkt = args
+    return transform_geoms(geoms, src_wkt, dst_wkt)
+
+
+def reproject(
+    gdf: gpd.GeoDataFrame,
+    dst: Any = "EPSG:4326",
+    workers: int | None = None,
+    parallel_min_coords: int = PARALLEL_MIN_COORDS,
+) -> gpd.GeoDataFrame:
+    """Drop-in for `gdf.to_crs(dst)` used by all pipeline stages.
+
+    - returns `gdf` unchanged when it is already in `dst` (relabelled if only axis order differs)
+    - reuses cached pyproj Transformers
+    - transforms whole coordinate arrays via `shapely.transform`
+    - splits large layers across a process pool (`workers`, default CPU count)
+    """
+    import geopandas as gpd
+    import numpy as np
+    import shapely
+
+    if gdf.crs is None:
+        raise ValueError("Cannot reproject a GeoDataFrame without a CRS; use set_crs first")
+    if same_crs(gdf.crs, dst):
+        # Skip the transform, but still label the output as `dst` (e.g. OGC:CRS84 -> EPSG:4326)
+        if gdf.crs.equals(_crs(dst)):
+            return gdf
+        return gdf.set_crs(_crs(dst), allow_override=True)
+
+    src_wkt = gdf.crs.to_wkt()
+    dst_wkt = _crs(dst).to_wkt()
+    geoms = np.asarray(gdf.geometry.array, dtype=object)
+
+    workers = workers or os.cpu_count() or 1
+    n_coords = int(shapely.get_num_coordinates(geoms).sum())
+    if workers > 1 and n_coords >= parallel_min_coords and len(geoms) > 1:
+        chunks = np.array_split(geoms, min(len(geoms), workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_transform_chunk, [(c, src_wkt, dst_wkt) for c in chunks]))
+        out = np.concatenate(parts)
+    else:
+        out = transform_geoms(geoms, src_wkt, dst_wkt)
+
+    result = gdf.copy()
+    result[gdf.geometry.name] = gpd.GeoSeries(out, index=gdf.index, crs=_crs(dst))
+    return result
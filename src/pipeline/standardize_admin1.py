@@ -2,11 +2,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import geopandas as gpd
+from reproject import reproject
 
 RAW = Path("data/raw/natural_earth/ne_10m_admin_1_states_provinces.geojson")
 OUT_DIR = Path("data/processed/natural_earth")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_FULL = OUT_DIR / "admin1_standardized.geoparquet"
 OUT_SAMPLE = Path("data/sample/admin1_canada_sample.geoparquet")  # small, ok to commit
@@ -20,6 +19,8 @@ def main() -> int:
     if not RAW.exists():
         raise FileNotFoundError(f"Missing raw file: {RAW.resolve()} (run ingest first)")
 
+    import geopandas as gpd
+
     gdf = gpd.read_file(RAW)
     print("OK: read rows =", len(gdf))
     print("OK: columns =", len(gdf.columns))
@@ -29,7 +30,7 @@ def main() -> int:
     if gdf.crs is None:
         gdf = gdf.set_crs("EPSG:4326")
     else:
-        gdf = gdf.to_crs("EPSG:4326")
+        gdf = reproject(gdf, "EPSG:4326")  # no-op when already WGS84
 
     # Geometry validity checks (before/after)
     invalid_before = int((~gdf.is_valid).sum())
@@ -56,6 +57,7 @@ def main() -> int:
     print("OK: rows (final) =", len(gdf))
 
     # Write full standardized output (not committed)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
     gdf.to_parquet(OUT_FULL, index=False)
     print("OK: wrote", OUT_FULL.as_posix())
 
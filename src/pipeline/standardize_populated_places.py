@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import geopandas as gpd
+from reproject import reproject
 
 RAW = Path("data/raw/natural_earth/ne_10m_populated_places.geojson")
 
 OUT_DIR = Path("data/processed/natural_earth")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OUT_FULL = OUT_DIR / "populated_places_standardized.geoparquet"
 OUT_SAMPLE = Path("data/sample/populated_places_canada_sample.geoparquet")  # small, ok to commit
@@ -23,6 +22,8 @@ def main() -> int:
             f"Missing raw file: {RAW.resolve()} (run ingest_populated_places first)"
         )
 
+    import geopandas as gpd
+
     gdf = gpd.read_file(RAW)
     print("OK: read rows =", len(gdf))
     print("OK: columns =", len(gdf.columns))
@@ -32,7 +33,7 @@ def main() -> int:
     if gdf.crs is None:
         gdf = gdf.set_crs("EPSG:4326")
     else:
-        gdf = gdf.to_crs("EPSG:4326")
+        gdf = reproject(gdf, "EPSG:4326")  # no-op when already WGS84
 
     # Standardize column names
     gdf = gdf.rename(columns={c: _snake(c) for c in gdf.columns})
@@ -52,6 +53,7 @@ def main() -> int:
     print("OK: rows (final) =", len(gdf))
 
     # Write full standardized output (ignored by git)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
     gdf.to_parquet(OUT_FULL, index=False)
     print("OK: wrote", OUT_FULL.as_posix())
 
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import geopandas as gpd
-import pandas as pd
+if TYPE_CHECKING:
+    import geopandas as gpd
 
 RAW = Path("data/raw/natural_earth/ne_10m_admin_1_states_provinces.geojson")
 STD = Path("data/processed/natural_earth/admin1_standardized.geoparquet")
 
 OUT_DIR = Path("docs/qa")
-OUT_DIR.mkdir(parents=True, exist_ok=True)
 OUT_CSV = OUT_DIR / "admin1_qa_report.csv"
 
 
@@ -63,6 +63,9 @@ def main() -> int:
             f"Missing standardized file: {STD.resolve()} (run standardize first)"
         )
 
+    import geopandas as gpd
+    import pandas as pd
+
     raw = gpd.read_file(RAW)
     std = gpd.read_parquet(STD)
 
@@ -117,6 +120,7 @@ def main() -> int:
             add(k, raw_stats.get(k, "n/a"), std_stats.get(k, "n/a"))
 
     report = pd.DataFrame(rows)
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
     report.to_csv(OUT_CSV, index=False)
 
     print("OK: wrote QA report:", OUT_CSV.as_posix())
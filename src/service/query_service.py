@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlsplit
+
+if TYPE_CHECKING:
+    import duckdb
+
+SNAP_DIR = Path("data/processed/db/snapshots")  # written by src/pipeline/publish_db_snapshot.py
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    sql: str
+    params: dict[str, type] = field(default_factory=dict)
+    defaults: dict[str, Any] = field(default_factory=dict)
+
+
+# Only these parameterized queries are served; clients never send SQL.
+# They read tables materialized by the pipeline, so no spatial extension is needed here.
+QUERIES: dict[str, NamedQuery] = {
+    "cities_by_admin1": NamedQuery(
+        sql="""
+        SELECT
+          admin1_name,
+          adm1_code,
+          COUNT(*) AS city_count,
+          ROUND(SUM(COALESCE(pop_max, 0))::DOUBLE, 0) AS sum_pop_max
+        FROM city_admin1
+        WHERE admin_country = $country
+        GROUP BY 1,2
+        ORDER BY city_count DESC, sum_pop_max DESC;
+        """,
+        params={"country": str},
+    ),
+    "top_admin1": NamedQuery(
+        sql="""
+        SELECT
+          admin_country,
+          admin1_name,
+          adm1_code,
+          COUNT(*) AS city_count,
+          ROUND(SUM(COALESCE(pop_max, 0))::DOUBLE, 0) AS sum_pop_max
+        FROM city_admin1
+        GROUP BY 1,2,3
+        ORDER BY city_count DESC, sum_pop_max DESC
+        LIMIT $limit;
+        """,
+        params={"limit": int},
+        defaults={"limit": 50},
+    ),
+    "area_by_admin1": NamedQuery(
+        sql="""
+        SELECT name, adm1_code, area_km2
+        FROM admin1_area
+        WHERE admin = $country
+        ORDER BY area_km2 DESC;
+        """,
+        params={"country": str},
+    ),
+}
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    version: str
+    columns: list[str]
+    rows: list[list[Any]]
+    cached: bool = False
+
+
+def bind_params(q: NamedQuery, raw: Mapping[str, str]) -> dict[str, Any]:
+    unknown = set(raw) - set(q.params)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+    out: dict[str, Any] = {}
+    for name, typ in q.params.items():
+        if name in raw:
+            try:
+                out[name] = typ(raw[name])
+            except ValueError as e:
+                raise ValueError(f"Bad value for {name!r}: {raw[name]!r}") from e
+        elif name in q.defaults:
+            out[name] = q.defaults[name]
+        else:
+            raise ValueError(f"Missing parameter: {name}")
+    return out
+
+
+def current_snapshot(snap_dir: Path = SNAP_DIR) -> Path:
+    pointer = snap_dir / "CURRENT"
+    if not pointer.exists():
+        raise FileNotFoundError(
+            f"Missing snapshot pointer: {pointer.resolve()} (run publish_db_snapshot first)"
+        )
+    return snap_dir / pointer.read_text(encoding="utf-8").strip()
+
+
+def _execute(con: duckdb.DuckDBPyConnection, sql: str, params: dict[str, Any]):
+    cur = con.execute(sql, params)
+    columns = [d[0] for d in cur.description]
+    return columns, [list(r) for r in cur.fetchall()]
+
+
+class UnknownQuery(Exception):
+    """Requested name is not in QUERIES."""
+
+
+class PoolClosed(Exception):
+    """The pool was retired by a snapshot swap and has already closed its connections."""
+
+
+class ConnectionPool:
+    """Fixed set of read-only connections to one snapshot; each is used by one task at a time."""
+
+    def __init__(self, db_path: Path, size: int) -> None:
+        self.db_path = db_path
+        self.version = db_path.name
+        self._size = size
+        self._free: asyncio.Queue[duckdb.DuckDBPyConnection] = asyncio.Queue()
+        self._active = 0  # tasks waiting for or holding a connection
+        self._closed = False
+        self._finished = False
+
+    async def open(self) -> ConnectionPool:
+        import duckdb
+
+        for _ in range(self._size):
+            con = await asyncio.to_thread(duckdb.connect, str(self.db_path), read_only=True)
+            self._free.put_nowait(con)
+        return self
+
+    async def run(self, sql: str, params: dict[str, Any]):
+        if self._finished:
+            raise PoolClosed(self.version)
+        self._active += 1
+        try:
+            con = await self._free.get()
+        except BaseException:
+            self._release(None)
+            raise
+        # If the caller is cancelled (client disconnect) the thread keeps using `con`;
+        # it only goes back to the pool once the thread is done with it
+        work = asyncio.ensure_future(asyncio.to_thread(_execute, con, sql, params))
+        work.add_done_callback(lambda t: self._release(con, t))
+        return await asyncio.shield(work)
+
+    def _release(self, con: duckdb.DuckDBPyConnection | None, work: asyncio.Future | None = None):
+        if work is not None and not work.cancelled():
+            work.exception()  # retrieved by the caller, or nobody is left to care
+        if con is not None:
+            self._free.put_nowait(con)
+        self._active -= 1
+        self._maybe_finish()
+
+    def _maybe_finish(self) -> None:
+        if self._closed and self._active == 0 and not self._finished:
+            self._finished = True
+            while not self._free.empty():
+                self._free.get_nowait().close()
+
+    def close(self) -> None:
+        # A retired pool keeps serving tasks already queued on it; the connections
+        # are closed once the last of them is done
+        self._closed = True
+        self._maybe_finish()
+
+
+class QueryService:
+    """Serves QUERIES from the current snapshot with an LRU cache keyed by version+query+params.
+
+    A new snapshot (CURRENT changed) swaps in a fresh pool and drops the cache.
+    Concurrent identical requests share one execution.
+    """
+
+    def __init__(
+        self,
+        snap_dir: Path = SNAP_DIR,
+        pool_size: int = 4,
+        cache_size: int = 256,
+        check_interval: float = 1.0,
+    ) -> None:
+        self.snap_dir = snap_dir
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self.check_interval = check_interval
+        self._pool: ConnectionPool | None = None
+        self._checked_at = float("-inf")
+        self._swap_lock = asyncio.Lock()
+        self._cache: OrderedDict[tuple, QueryResult] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Task[QueryResult]] = {}
+
+    async def _current_pool(self) -> ConnectionPool:
+        if self._pool is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._pool
+        async with self._swap_lock:
+            snap = current_snapshot(self.snap_dir)
+            self._checked_at = time.monotonic()
+            if self._pool is None or self._pool.db_path != snap:
+                new = await ConnectionPool(snap, self.pool_size).open()
+                old, self._pool = self._pool, new
+                self._cache.clear()
+                if old is not None:
+                    old.close()
+                print("OK: serving snapshot", snap.as_posix())
+            return self._pool
+
+    async def query(self, name: str, raw_params: Mapping[str, str] | None = None) -> QueryResult:
+        if name not in QUERIES:
+            raise UnknownQuery(name)
+        q = QUERIES[name]
+        params = bind_params(q, raw_params or {})
+
+        pool = await self._current_pool()
+        key = (pool.version, name, tuple(sorted(params.items())))
+
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return QueryResult(hit.version, hit.columns, hit.rows, cached=True)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            res = await asyncio.shield(pending)
+            return QueryResult(res.version, res.columns, res.rows, cached=True)
+
+        # The execution is its own task so a requester disconnecting (cancelled) does not
+        # cancel the shared result for the identical requests waiting on it
+        work = asyncio.ensure_future(self._execute(key, q, params, pool))
+        work.add_done_callback(lambda t: t.cancelled() or t.exception())  # never "unretrieved"
+        self._inflight[key] = work
+        return await asyncio.shield(work)
+
+    async def _execute(
+        self, key: tuple, q: NamedQuery, params: dict[str, Any], pool: ConnectionPool
+    ) -> QueryResult:
+        try:
+            while True:
+                try:
+                    columns, rows = await pool.run(q.sql, params)
+                    break
+                except PoolClosed:
+                    # Retired between lookup and run: retry on the pool that replaced it
+                    pool = await self._current_pool()
+        finally:
+            del self._inflight[key]
+
+        res = QueryResult(pool.version, columns, rows)
+        if pool is self._pool and pool.version == key[0]:
+            self._cache[key] = res
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return res
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+
+async def _handle(
+    service: QueryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    status, body = 500, {"error": "internal error"}
+    try:
+        request_line = (await reader.readline()).decode("latin-1")
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        method, target, _ = request_line.split(" ", 2)
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+
+        if method != "GET":
+            status, body = 405, {"error": "only GET is supported"}
+        elif parts == ["queries"]:
+            status, body = 200, {n: sorted(q.params) for n, q in QUERIES.items()}
+        elif len(parts) == 2 and parts[0] == "query":
+            res = await service.query(parts[1], dict(parse_qsl(url.query)))
+            status = 200
+            body = {
+                "query": parts[1],
+                "version": res.version,
+                "cached": res.cached,
+                "columns": res.columns,
+                "rows": res.rows,
+            }
+        else:
+            status, body = 404, {"error": f"no route for {url.path}"}
+    except UnknownQuery as e:
+        status, body = 404, {"error": f"unknown query: {e.args[0]}"}
+    except ValueError as e:
+        status, body = 400, {"error": str(e)}
+    except Exception as e:
+        status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+    finally:
+        payload = json.dumps(body, default=str).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        await writer.drain()
+        writer.close()
+
+
+async def serve(host: str, port: int, service: QueryService) -> None:
+    await service._current_pool()  # fail fast if nothing is published yet
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port)
+    print(f"OK: listening on http://{host}:{port}/query/<name>?param=value")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Read-only query service over published gis.duckdb snapshots."
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--snap-dir", type=Path, default=SNAP_DIR)
+    p.add_argument("--pool-size", type=int, default=4, help="read-only DuckDB connections")
+    p.add_argument("--cache-size", type=int, default=256, help="cached results (LRU)")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    service = QueryService(args.snap_dir, pool_size=args.pool_size, cache_size=args.cache_size)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,17 +3,18 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-import duckdb
-import geopandas as gpd
-import pandas as pd
-from shapely.geometry import Point
-
 ROOT = Path(__file__).resolve().parents[1]
 SAMPLE_DIR = ROOT / "data" / "sample"
-SAMPLE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def main() -> int:
+    import duckdb
+    import geopandas as gpd
+    import pandas as pd
+    from shapely.geometry import Point
+
+    SAMPLE_DIR.mkdir(parents=True, exist_ok=True)
+
     # Small sample points (Toronto-ish) to prove the stack works end-to-end
     df = pd.DataFrame(
         {
@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+GISDE = Path(__file__).resolve().parents[1] / "src" / "gisde.py"
+HEAVY = ["duckdb", "geopandas", "pandas", "pyproj", "shapely"]
+
+# Wall-clock budget for `gisde --help` (best of several runs); override on slow machines
+STARTUP_BUDGET_S = float(os.environ.get("GISDE_STARTUP_BUDGET_S", "1.0"))
+
+
+def test_importing_commands_is_lazy_and_side_effect_free(tmp_path):
+    code = f"""
+import importlib, json, sys
+sys.path.insert(0, {str(GISDE.parent)!r})
+import gisde
+gisde.setup_path()
+for module, _, _ in gisde.COMMANDS.values():
+    importlib.import_module(module)
+print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True, check=True
+    )
+    assert json.loads(out.stdout) == []
+    assert list(tmp_path.iterdir()) == [], "modules must not create directories at import"
+
+
+def test_forwarded_help_uses_subcommand_name(tmp_path):
+    out = subprocess.run(
+        [sys.executable, str(GISDE), "serve", "--help"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.startswith("usage: gisde serve ")
+
+
+def test_help_startup_time(tmp_path):
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(GISDE), "--help"], cwd=tmp_path, capture_output=True, check=True
+        )
+        best = min(best, time.perf_counter() - t0)
+    assert best < STARTUP_BUDGET_S, f"gisde --help took {best:.2f}s (budget {STARTUP_BUDGET_S}s)"
@@ -0,0 +1,152 @@
+import sys
+from pathlib import Path
+
+import duckdb
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+from shapely.geometry import box as box_geom
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "pipeline"))
+
+from analyze_cities_to_admin1_partitioned import (  # noqa: E402
+    _weight_expr,
+    cell_bounds,
+    grid_shape,
+    merge_partials,
+    run,
+)
+
+ADMIN1_SAMPLE = ROOT / "data/sample/admin1_canada_sample.geoparquet"
+CITIES_SAMPLE = ROOT / "data/sample/populated_places_canada_sample.geoparquet"
+
+
+def test_cell_bounds_roundtrip():
+    ncols, nrows = grid_shape(10)
+    assert (ncols, nrows) == (36, 18)
+    assert cell_bounds(0, 10) == (-180, -90, -170, -80)
+    # Toronto (-79.4, 43.7) -> col 10, row 13
+    assert cell_bounds(13 * ncols + 10, 10) == (-80, 40, -70, 50)
+
+
+def test_merge_partials_sums_across_partitions():
+    cols = ["admin_country", "admin1_name", "adm1_code", "city_count", "sum_pop_max"]
+    a = pd.DataFrame(
+        [["Canada", "Ontario", "CAN-1", 2, 10.4], ["Canada", "Yukon", "CAN-2", 1, 1.0]],
+        columns=cols,
+    )
+    b = pd.DataFrame([["Canada", "Ontario", "CAN-1", 3, 5.3]], columns=cols)
+    empty = pd.DataFrame(columns=cols)
+
+    df = merge_partials([a, empty, b], limit=1)
+
+    assert list(df.columns) == cols
+    assert df.to_dict("records") == [
+        {
+            "admin_country": "Canada",
+            "admin1_name": "Ontario",
+            "adm1_code": "CAN-1",
+            "city_count": 5,
+            "sum_pop_max": 16.0,
+        }
+    ]
+
+
+@pytest.fixture
+def spatial_con():
+    con = duckdb.connect(database=":memory:")
+    try:
+        con.execute("INSTALL spatial;")
+        con.execute("LOAD spatial;")
+    except duckdb.Error as e:
+        con.close()
+        pytest.skip(f"DuckDB spatial extension unavailable: {e}")
+    yield con
+    con.close()
+
+
+def _baseline(con, points: Path, admin1: Path) -> pd.DataFrame:
+    # Same single join + aggregation as analyze_cities_to_admin1.py, without the LIMIT
+    for table, path in (("cities", points), ("admin1", admin1)):
+        p = path.as_posix().replace("'", "''")
+        t = con.execute(f"SELECT typeof(geometry) FROM read_parquet('{p}') LIMIT 1").fetchone()[0]
+        geom = "geometry" if "GEOMETRY" in str(t).upper() else "ST_GeomFromWKB(geometry)"
+        con.execute(
+            f"CREATE OR REPLACE TABLE {table} AS "
+            f"SELECT * EXCLUDE (geometry), {geom} AS geom FROM read_parquet('{p}')"
+        )
+    return con.execute(
+        """
+        SELECT
+          a.admin AS admin_country,
+          a.name AS admin1_name,
+          a.adm1_code AS adm1_code,
+          COUNT(*) AS city_count,
+          ROUND(SUM(COALESCE(c.pop_max, 0))::DOUBLE, 0) AS sum_pop_max
+        FROM cities c
+        JOIN admin1 a
+          ON ST_Intersects(a.geom, c.geom)
+        GROUP BY 1,2,3;
+        """
+    ).df()
+
+
+@pytest.mark.parametrize("cell_deg", [10, 0.1])
+def test_partitioned_run_matches_single_join(spatial_con, tmp_path, cell_deg):
+    cities = gpd.read_parquet(CITIES_SAMPLE)[["name", "pop_max", "geometry"]]
+    # Grid edges for 10 deg cells: on a cell corner inside Ontario, on a cell edge
+    # inside Manitoba, and lon=180 / lat=90 which are clamped into the last column/row.
+    # x=-77.2 lands in the 0.1 deg cell whose computed xmin is -77.19999999999999, one ulp
+    # above it; it sits on the right edge of a box whose bbox ends exactly at -77.2.
+    edges = gpd.GeoDataFrame(
+        {"name": ["corner", "edge", "antimeridian", "pole", "ulp"], "pop_max": [1, 2, 3, 4, 5]},
+        geometry=[
+            Point(-80, 50),
+            Point(-100, 60),
+            Point(180, 60),
+            Point(-100, 90),
+            Point(-77.2, 45.05),
+        ],
+        crs=cities.crs,
+    )
+    points = tmp_path / "points.geoparquet"
+    pd.concat([cities, edges], ignore_index=True).pipe(gpd.GeoDataFrame).to_parquet(points)
+
+    admin1_sample = gpd.read_parquet(ADMIN1_SAMPLE)[["admin", "name", "adm1_code", "geometry"]]
+    box = gpd.GeoDataFrame(
+        {"admin": ["Test"], "name": ["Box"], "adm1_code": ["TST-1"]},
+        geometry=[box_geom(-77.3, 45.0, -77.2, 45.1)],
+        crs=admin1_sample.crs,
+    )
+    admin1 = tmp_path / "admin1.geoparquet"
+    pd.concat([admin1_sample, box], ignore_index=True).pipe(gpd.GeoDataFrame).to_parquet(admin1)
+
+    expected = _baseline(spatial_con, points, admin1)
+    assert "TST-1" in set(expected["adm1_code"])
+    got = run(
+        points, admin1, cell_deg=cell_deg, workers=2, spill_dir=tmp_path / "spill", limit=None
+    )
+
+    assert len(got) == len(expected) > 0
+    pd.testing.assert_frame_equal(
+        got.sort_values("adm1_code").reset_index(drop=True),
+        expected.sort_values("adm1_code").reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert not (tmp_path / "spill" / "duckdb_tmp").exists()
+
+    unweighted = run(points, admin1, cell_deg=cell_deg, workers=2, limit=None, weight_col=None)
+    assert (unweighted["sum_pop_max"] == 0).all()
+    assert sorted(unweighted["city_count"]) == sorted(expected["city_count"])
+
+
+def test_weight_column_is_optional():
+    con = duckdb.connect(database=":memory:")
+    path = CITIES_SAMPLE.as_posix()
+    assert _weight_expr(con, path, None) == "0::DOUBLE"
+    assert _weight_expr(con, path, "pop_max") == '"pop_max"'
+    with pytest.raises(ValueError, match="--weight-col"):
+        _weight_expr(con, path, "no_such_column")
+    con.close()
@@ -0,0 +1,152 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src" / "pipeline"))
+sys.path.insert(0, str(ROOT / "src" / "service"))
+
+from publish_db_snapshot import publish  # noqa: E402
+from query_service import (  # noqa: E402
+    QUERIES,
+    ConnectionPool,
+    NamedQuery,
+    QueryService,
+    UnknownQuery,
+)
+
+# Long enough (~0.5s) to still hold the only connection while the snapshot swaps
+SLOW = NamedQuery(sql="SELECT sum(i * $n) AS s FROM range(200000000) t(i)", params={"n": int})
+
+
+def _build_db(path: Path, ontario_cities: int) -> None:
+    con = duckdb.connect(str(path))
+    con.execute(
+        "CREATE OR REPLACE TABLE city_admin1 AS "
+        "SELECT 'c' || i AS city_name, 'Canada' AS admin_country, 'Ontario' AS admin1_name, "
+        "'CAN-1' AS adm1_code, 100 AS pop_max FROM range(?) t(i)",
+        [ontario_cities],
+    )
+    con.execute(
+        "CREATE OR REPLACE TABLE admin1_area AS "
+        "SELECT 'Canada' AS admin, 'Ontario' AS name, 'CAN-1' AS adm1_code, 1076395.0 AS area_km2"
+    )
+    con.close()
+
+
+def test_cache_and_snapshot_invalidation(tmp_path):
+    db = tmp_path / "gis.duckdb"
+    snaps = tmp_path / "snapshots"
+    _build_db(db, 3)
+    publish(db, snaps)
+
+    async def scenario():
+        svc = QueryService(snaps, pool_size=2, check_interval=0)
+        try:
+            first = await asyncio.gather(
+                *(svc.query("cities_by_admin1", {"country": "Canada"}) for _ in range(5))
+            )
+            assert [r.rows for r in first] == [[["Ontario", "CAN-1", 3, 300.0]]] * 5
+            assert sum(not r.cached for r in first) == 1
+
+            again = await svc.query("cities_by_admin1", {"country": "Canada"})
+            assert again.cached
+
+            _build_db(db, 4)
+            publish(db, snaps)
+            fresh = await svc.query("cities_by_admin1", {"country": "Canada"})
+            assert not fresh.cached
+            assert fresh.version != first[0].version
+            assert fresh.rows == [["Ontario", "CAN-1", 4, 400.0]]
+
+            area = await svc.query("area_by_admin1", {"country": "Canada"})
+            assert area.columns == ["name", "adm1_code", "area_km2"]
+
+            with pytest.raises(ValueError):
+                await svc.query("top_admin1", {"limit": "many"})
+            with pytest.raises(UnknownQuery):
+                await svc.query("no_such_query")
+        finally:
+            svc.close()
+
+    asyncio.run(scenario())
+
+
+def test_waiter_on_retired_pool_completes(tmp_path, monkeypatch):
+    monkeypatch.setitem(QUERIES, "slow", SLOW)
+    db = tmp_path / "gis.duckdb"
+    snaps = tmp_path / "snapshots"
+    _build_db(db, 3)
+    publish(db, snaps)
+
+    async def scenario():
+        svc = QueryService(snaps, pool_size=1, check_interval=0)
+        try:
+            running = asyncio.create_task(svc.query("slow", {"n": "1"}))
+            blocked = asyncio.create_task(svc.query("slow", {"n": "2"}))
+            await asyncio.sleep(0.1)  # first holds the connection, second waits for it
+            old = await svc._current_pool()
+
+            publish(db, snaps)
+            fresh = await svc.query("cities_by_admin1", {"country": "Canada"})
+            assert fresh.version != old.version
+
+            done = await asyncio.wait_for(asyncio.gather(running, blocked), timeout=30)
+            assert [r.version for r in done] == [old.version, old.version]
+            assert old._free.empty(), "retired pool closes its connections once drained"
+        finally:
+            svc.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_query_keeps_connection_until_thread_finishes(tmp_path):
+    db = tmp_path / "gis.duckdb"
+    _build_db(db, 1)
+
+    async def scenario():
+        pool = await ConnectionPool(db, 1).open()
+        try:
+            task = asyncio.create_task(pool.run(SLOW.sql, {"n": 1}))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert pool._free.empty(), "connection returned while its thread is still running"
+
+            con = await asyncio.wait_for(pool._free.get(), timeout=30)
+            pool._free.put_nowait(con)
+        finally:
+            pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_first_request_keeps_shared_result(tmp_path, monkeypatch):
+    monkeypatch.setitem(QUERIES, "slow", SLOW)
+    db = tmp_path / "gis.duckdb"
+    snaps = tmp_path / "snapshots"
+    _build_db(db, 1)
+    publish(db, snaps)
+
+    async def scenario():
+        svc = QueryService(snaps, pool_size=1, check_interval=0)
+        try:
+            first = asyncio.create_task(svc.query("slow", {"n": "1"}))
+            await asyncio.sleep(0.05)
+            second = asyncio.create_task(svc.query("slow", {"n": "1"}))
+            await asyncio.sleep(0.05)  # second now waits on the shared execution
+
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            res = await asyncio.wait_for(second, timeout=30)
+            assert res.cached and res.rows and res.rows[0][0] is not None
+        finally:
+            svc.close()
+
+    asyncio.run(scenario())
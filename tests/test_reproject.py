@@ -0,0 +1,49 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "pipeline"))
+
+from reproject import get_transformer, reproject  # noqa: E402
+
+ADMIN1_SAMPLE = Path(__file__).resolve().parents[1] / "data/sample/admin1_canada_sample.geoparquet"
+
+
+def test_same_crs_is_a_noop():
+    gdf = gpd.read_parquet(ADMIN1_SAMPLE)
+    assert reproject(gdf, "EPSG:4326") is gdf
+
+
+def test_axis_order_only_difference_is_relabelled_not_transformed():
+    gdf = gpd.read_parquet(ADMIN1_SAMPLE).set_crs("OGC:CRS84", allow_override=True)
+    out = reproject(gdf, "EPSG:4326")
+    assert out.crs.to_epsg() == 4326
+    assert gdf.crs.to_string() == "OGC:CRS84", "input is left untouched"
+    assert out.geometry.array[0] is gdf.geometry.array[0]
+
+
+def test_matches_to_crs_serial_and_parallel():
+    gdf = gpd.read_parquet(ADMIN1_SAMPLE).to_crs(3978)  # Canada Atlas Lambert
+    expected = gdf.to_crs(4326)
+
+    for kwargs in ({"workers": 1}, {"workers": 2, "parallel_min_coords": 0}):
+        out = reproject(gdf, 4326, **kwargs)
+        assert out.crs.equals(expected.crs)
+        assert list(out.columns) == list(gdf.columns)
+        np.testing.assert_allclose(
+            shapely.get_coordinates(out.geometry.array),
+            shapely.get_coordinates(expected.geometry.array),
+        )
+
+
+def test_transformer_is_cached_per_thread():
+    t = get_transformer("EPSG:3978", "EPSG:4326")
+    assert get_transformer("EPSG:3978", "EPSG:4326") is t
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(get_transformer, "EPSG:3978", "EPSG:4326").result()
+    assert other is not t